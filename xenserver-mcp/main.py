@@ -4,17 +4,43 @@ XenServer MCP Server - A Model Context Protocol server for XenServer/XCP-ng hype
 Provides tools for querying XenServer objects via XenAPI.
 """
 
+import asyncio
 import contextlib
+import dataclasses
+import functools
+import http.client
+import itertools
 import logging
 import os
+import queue
+import socket
+import threading
+import time
+import xmlrpc.client
 from datetime import date
-from typing import Any, Dict, Optional, Iterable
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
 
-import XenAPI
 from dotenv import load_dotenv
 from mcp.server.fastmcp import FastMCP
 from starlette.applications import Starlette
-from starlette.routing import Mount
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+from starlette.routing import Mount, Route
+
+if TYPE_CHECKING:
+    import XenAPI
+
+# XenAPI is imported on first use to keep module import cheap
+_xenapi = None
+
+
+def _load_xenapi():
+    """Import the XenAPI module on first use and return it."""
+    global _xenapi
+    if _xenapi is None:
+        import XenAPI as _xenapi
+    return _xenapi
+
 
 # Configure logging
 logging.basicConfig(
@@ -27,18 +53,21 @@ logger = logging.getLogger(__name__)
 def load_environment() -> None:
     """Load environment variables from .env file in multiple possible locations."""
     env_paths = ['/app/.env', '.env', '../.env']
-    for env_path in env_paths:
-        if os.path.exists(env_path):
-            load_dotenv(env_path)
-            logger.info(f"Loaded environment from {env_path}")
-            return
-    logger.warning("No .env file found in any of the expected locations")
+    env_path = next((p for p in env_paths if os.path.exists(p)), None)
+    if env_path is None:
+        logger.warning("No .env file found in any of the expected locations")
+        return
+    load_dotenv(env_path)
+    logger.info(f"Loaded environment from {env_path}")
 
 
+@functools.lru_cache(maxsize=1)
 def get_xenserver_config() -> tuple[Optional[str], Optional[str], Optional[str]]:
     """
     Get XenServer configuration from environment variables.
     
+    The result is cached, so the environment is read only once per process.
+    
     Returns:
         Tuple of (host, user, password) - may contain None values if not configured
     """
@@ -59,10 +88,58 @@ load_environment()
 XENSERVER_HOST, XENSERVER_USER, XENSERVER_PASS = get_xenserver_config()
 XENSERVER_URL = f"http://{XENSERVER_HOST}" if XENSERVER_HOST else None
 
+# Maximum number of idle sessions kept in the pool; extra sessions from bursts are logged out
+SESSION_POOL_MAX_IDLE = 8
+
+# Session usage is logged at INFO once every SESSION_LOG_INTERVAL sessions instead of per call
+SESSION_LOG_INTERVAL = 100
+_session_uses = itertools.count(1)
+
 # Create the XenServer MCP server with stateless HTTP
 xenserver_mcp = FastMCP(name="XenServerMCP", stateless_http=True)
 
 
+# Socket timeout in seconds for XenAPI connections, so a dropped connection fails instead of hanging
+XENAPI_TIMEOUT = 30
+
+# TCP keep-alive tuning for pooled connections: first probe after 60s idle, then every 15s,
+# giving up after 4 unanswered probes. Options missing on the platform are skipped.
+TCP_KEEPALIVE_OPTIONS: tuple[tuple[str, int], ...] = (
+    ("TCP_KEEPIDLE", 60),
+    ("TCP_KEEPINTVL", 15),
+    ("TCP_KEEPCNT", 4),
+)
+
+
+class _KeepAliveHTTPConnection(http.client.HTTPConnection):
+    """HTTPConnection that enables tuned TCP keep-alive probes on its socket."""
+    
+    def connect(self) -> None:
+        super().connect()
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        for option, value in TCP_KEEPALIVE_OPTIONS:
+            if hasattr(socket, option):
+                self.sock.setsockopt(socket.IPPROTO_TCP, getattr(socket, option), value)
+
+
+class KeepAliveTransport(xmlrpc.client.Transport):
+    """
+    XML-RPC transport for pooled XenAPI sessions.
+    
+    Like the stdlib Transport it reuses one HTTP/1.1 connection for all calls.
+    The connection additionally gets an XENAPI_TIMEOUT socket timeout, so a call
+    on a silently dropped connection fails instead of hanging, and keep-alive
+    probes that start well before typical firewall/NAT idle timeouts.
+    """
+    
+    def make_connection(self, host):
+        if self._connection and host == self._connection[0]:
+            return self._connection[1]
+        chost, self._extra_headers, _ = self.get_host_info(host)
+        self._connection = host, _KeepAliveHTTPConnection(chost, timeout=XENAPI_TIMEOUT)
+        return self._connection[1]
+
+
 class XenServerClient:
     """XenServer API client for managing connections and operations."""
     
@@ -79,12 +156,94 @@ class XenServerClient:
         self.username = username
         self.password = password
         self._logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        # Idle logged-in sessions, reused across requests instead of login/logout per call
+        self._idle_sessions: List["XenAPI.Session"] = []
+        self._sessions_lock = threading.Lock()
+        # Surplus sessions are logged out by a background worker, off the request path
+        self._logout_queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._logout_worker: Optional[threading.Thread] = None
+    
+    def _login(self) -> "XenAPI.Session":
+        """Open a new XenAPI session and log in with the configured credentials."""
+        self._logger.debug(f"Connecting to XenServer at {self.url} with user {self.username}")
+        session = _load_xenapi().Session(self.url, transport=KeepAliveTransport())
+        xenapi_metrics.timed("session.login_with_password",
+                             session.xenapi.login_with_password)(self.username, self.password)
+        self._logger.debug("Successfully logged in to XenServer")
+        return session
+    
+    def _acquire_session(self) -> "XenAPI.Session":
+        """Take an idle pooled session, or log in if none is available."""
+        with self._sessions_lock:
+            if self._idle_sessions:
+                return self._idle_sessions.pop()
+        return self._login()
+    
+    def _release_session(self, session: "XenAPI.Session") -> None:
+        """Return a session to the idle pool, or schedule its logout if the pool is full."""
+        with self._sessions_lock:
+            if len(self._idle_sessions) < SESSION_POOL_MAX_IDLE:
+                self._idle_sessions.append(session)
+                return
+            if self._logout_worker is None:
+                self._logout_worker = threading.Thread(
+                    target=self._drain_logout_queue, name="xenapi-logout", daemon=True
+                )
+                self._logout_worker.start()
+        self._logout_queue.put(session)
+    
+    def _drain_logout_queue(self) -> None:
+        """Background worker: log out sessions handed over by _release_session."""
+        while True:
+            self._safe_logout(self._logout_queue.get())
+    
+    def _safe_logout(self, session: "XenAPI.Session") -> None:
+        """Log out a session, logging rather than raising on failure."""
+        try:
+            session.xenapi.session.logout()
+            self._logger.debug("Successfully logged out from XenServer")
+        except Exception as logout_error:
+            self._logger.warning(f"Error during logout: {logout_error}")
+    
+    def _is_session_alive(self, session: "XenAPI.Session") -> bool:
+        """
+        Check a session with a cheap session.get_uuid round-trip.
+        
+        An expired session is logged in again by the XenAPI binding, so this
+        only fails when XenServer cannot be reached on the session's connection.
+        """
+        try:
+            session.xenapi.session.get_uuid(session._session)
+            return True
+        except Exception as validate_error:
+            self._logger.info(f"Discarding unusable XenServer session: {validate_error}")
+            return False
+    
+    def _ensure_session(self) -> None:
+        """Log in ahead of time so the pool holds at least one session."""
+        with self._sessions_lock:
+            if self._idle_sessions:
+                return
+        self._release_session(self._login())
+    
+    def ping_sessions(self) -> None:
+        """Exercise idle pooled sessions so they stay fresh, dropping any that fail the check."""
+        with self._sessions_lock:
+            sessions, self._idle_sessions = self._idle_sessions, []
+        for session in sessions:
+            if self._is_session_alive(session):
+                self._release_session(session)
     
     @contextlib.contextmanager
     def session(self):
         """
         Context manager for XenAPI session management.
         
+        Sessions are pooled: on exit the session is kept logged in and handed
+        to the next caller. If XenServer has expired a pooled session, the
+        XenAPI binding itself handles SESSION_INVALID by logging in again with
+        the saved credentials and retrying the call.
+        
         Yields:
             XenAPI.Session: Active XenServer session
             
@@ -92,14 +251,15 @@ class XenServerClient:
             XenAPI.Failure: If login fails
             Exception: For other connection errors
         """
+        xenapi = _load_xenapi()
+        uses = next(_session_uses)
+        if uses % SESSION_LOG_INTERVAL == 0:
+            self._logger.info(f"Served {uses} XenServer sessions ({len(self._idle_sessions)} idle in pool)")
         session = None
         try:
-            self._logger.info(f"Connecting to XenServer at {self.url} with user {self.username}")
-            session = XenAPI.Session(self.url)
-            session.xenapi.login_with_password(self.username, self.password)
-            self._logger.info("Successfully logged in to XenServer")
+            session = self._acquire_session()
             yield session
-        except XenAPI.Failure as xen_error:
+        except xenapi.Failure as xen_error:
             self._logger.error(f"XenAPI failure: {xen_error.details}")
             raise
         except Exception as e:
@@ -107,11 +267,14 @@ class XenServerClient:
             raise
         finally:
             if session:
-                try:
-                    session.xenapi.session.logout()
-                    self._logger.debug("Successfully logged out from XenServer")
-                except Exception as logout_error:
-                    self._logger.warning(f"Error during logout: {logout_error}")
+                self._release_session(session)
+    
+    def shutdown_sessions(self) -> None:
+        """Log out every pooled session. Called once at application shutdown."""
+        with self._sessions_lock:
+            sessions, self._idle_sessions = self._idle_sessions, []
+        for session in sessions:
+            self._safe_logout(session)
 
 
 def _initialize_xenserver_client() -> Optional[XenServerClient]:
@@ -129,36 +292,128 @@ def _initialize_xenserver_client() -> Optional[XenServerClient]:
         return None
 
 
-# Initialize XenServer client
-xenserver_client = _initialize_xenserver_client()
+@functools.lru_cache(maxsize=1)
+def get_client() -> Optional[XenServerClient]:
+    """
+    Return the process-wide XenServer client, creating it on first use.
+    
+    Returns:
+        XenServerClient instance or None if configuration is missing
+    """
+    return _initialize_xenserver_client()
 
 
-def _get_host_memory_info(session: XenAPI.Session, host_ref: str, 
-                          host_record: Dict[str, Any]) -> Dict[str, int]:
+class _XenAPICallMetrics:
+    """Thread-safe per-method call counters and latency histograms for XenAPI calls."""
+    
+    # Histogram bucket upper bounds in seconds
+    BUCKETS: tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+    
+    def __init__(self) -> None:
+        # method -> [per-bucket counts..., total count], and method -> total seconds
+        self._counts: Dict[str, List[int]] = {}
+        self._sums: Dict[str, float] = {}
+        self._lock = threading.Lock()
+    
+    def observe(self, method: str, seconds: float) -> None:
+        """Record one call of method that took the given number of seconds."""
+        with self._lock:
+            counts = self._counts.setdefault(method, [0] * (len(self.BUCKETS) + 1))
+            for i, bound in enumerate(self.BUCKETS):
+                if seconds <= bound:
+                    counts[i] += 1
+            counts[-1] += 1
+            self._sums[method] = self._sums.get(method, 0.0) + seconds
+    
+    def timed(self, method: str, func: Callable[..., Any]) -> Callable[..., Any]:
+        """Wrap a bound XenAPI method handle so each call is timed under method."""
+        def wrapper(*args: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                return func(*args)
+            finally:
+                self.observe(method, time.perf_counter() - start)
+        return wrapper
+    
+    def render(self) -> List[str]:
+        """Return the metrics as Prometheus text exposition lines."""
+        with self._lock:
+            snapshot = {method: (list(counts), self._sums[method]) for method, counts in self._counts.items()}
+        lines = [
+            "# HELP xenapi_calls_total Total XenAPI calls by method.",
+            "# TYPE xenapi_calls_total counter",
+        ]
+        for method, (counts, _) in snapshot.items():
+            lines.append(f'xenapi_calls_total{{method="{method}"}} {counts[-1]}')
+        lines += [
+            "# HELP xenapi_call_seconds XenAPI call latency by method.",
+            "# TYPE xenapi_call_seconds histogram",
+        ]
+        for method, (counts, total_seconds) in snapshot.items():
+            for bound, count in zip(self.BUCKETS, counts):
+                lines.append(f'xenapi_call_seconds_bucket{{method="{method}",le="{bound}"}} {count}')
+            lines.append(f'xenapi_call_seconds_bucket{{method="{method}",le="+Inf"}} {counts[-1]}')
+            lines.append(f'xenapi_call_seconds_sum{{method="{method}"}} {total_seconds}')
+            lines.append(f'xenapi_call_seconds_count{{method="{method}"}} {counts[-1]}')
+        return lines
+
+
+xenapi_metrics = _XenAPICallMetrics()
+
+
+def _fetch_host_records() -> tuple[Dict[str, Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+    """
+    Fetch all host and host_metrics records in two round-trips.
+    
+    Returns:
+        Tuple of (host_records, metrics_records), both keyed by reference
     """
-    Get memory information for a host.
+    with get_client().session() as session:
+        # Bind the leaf methods once; each dotted access builds a new XenAPI dispatcher
+        xenapi = session.xenapi
+        get_host_records = xenapi_metrics.timed("host.get_all_records", xenapi.host.get_all_records)
+        get_metrics_records = xenapi_metrics.timed("host_metrics.get_all_records",
+                                                   xenapi.host_metrics.get_all_records)
+        host_records = get_host_records()
+        metrics_records = get_metrics_records()
+    return host_records, metrics_records
+
+
+def _compute_free_memory(host_ref: str) -> int:
+    """
+    Compute free memory for a host on its own pooled session.
     
     Args:
-        session: Active XenAPI session
         host_ref: Host reference
-        host_record: Host record dictionary
         
     Returns:
-        Dictionary with 'free' and 'total' memory in bytes
+        Free memory in bytes, or 0 if it could not be computed
     """
     try:
-        free_memory = session.xenapi.host.compute_free_memory(host_ref)
-        metrics_ref = session.xenapi.host.get_metrics(host_ref)
-        total_memory = session.xenapi.host_metrics.get_memory_total(metrics_ref)
+        with get_client().session() as session:
+            compute_free_memory = xenapi_metrics.timed("host.compute_free_memory",
+                                                       session.xenapi.host.compute_free_memory)
+            # XML-RPC carries int64 values as strings
+            return int(compute_free_memory(host_ref))
     except Exception as e:
         logger.warning(f"Could not get memory metrics: {e}")
-        free_memory = 0
-        total_memory = host_record.get('memory_total', 0)
+        return 0
+
+
+def _get_host_memory_total(host_record: Dict[str, Any],
+                           metrics_records: Dict[str, Dict[str, Any]]) -> int:
+    """
+    Get total memory for a host from its host_metrics record.
     
-    return {
-        "free": free_memory,
-        "total": total_memory,
-    }
+    Args:
+        host_record: Host record dictionary
+        metrics_records: All host_metrics records keyed by reference
+        
+    Returns:
+        Total memory in bytes
+    """
+    metrics_record = metrics_records.get(host_record.get('metrics', ''), {})
+    return int(metrics_record.get('memory_total', host_record.get('memory_total', 0)))
 
 
 CPU_KEYS: tuple[str, ...] = (
@@ -194,47 +449,269 @@ LICENSE_KEYS: tuple[str, ...] = (
 )
 
 
-def _select_fields(source: Dict[str, Any], keys: Iterable[str]) -> Dict[str, Any]:
-    """Return a dict containing only selected keys (missing -> empty string)."""
-    result: Dict[str, Any] = {}
-    for k in keys:
-        v = source.get(k, "")
-        if not isinstance(v, str):
-            try:
-                v = str(v)
-            except Exception:
-                v = ""
-        result[k] = v
-    return result
-
-
-def _build_host_info(session: XenAPI.Session, host_ref: str) -> Dict[str, Any]:
-    """Build tailored host information dictionary with filtered cpu/bios/license fields."""
-    host_record = session.xenapi.host.get_record(host_ref)
-    memory_info = _get_host_memory_info(session, host_ref, host_record)
-
-    cpu_full = host_record.get('cpu_info', {}) or {}
-    bios_full = host_record.get('bios_strings', {}) or {}
-    license_full = host_record.get('license_params', {}) or {}
-
-    cpu_filtered = _select_fields(cpu_full, CPU_KEYS)
-    bios_filtered = _select_fields(bios_full, BIOS_KEYS)
-    license_filtered = _select_fields(license_full, LICENSE_KEYS)
-
-    return {
-        "uuid": host_record.get('uuid', ''),
-        "name": host_record.get('name_label', ''),
-        "description": host_record.get('name_description', ''),
-        "memory": memory_info,
-        "cpu": cpu_filtered,
-        "bios": bios_filtered,
-        "version": host_record.get('software_version', {}),
-        "license": license_filtered,
-    }
+# (section, key) for every selected field, in response order; sections are cpu, bios, license
+_SELECTED_FIELDS: tuple[tuple[int, str], ...] = (
+    tuple((0, k) for k in CPU_KEYS)
+    + tuple((1, k) for k in BIOS_KEYS)
+    + tuple((2, k) for k in LICENSE_KEYS)
+)
+
+
+def _extract_host_fields(host_record: Dict[str, Any]) -> tuple[Dict[str, str], Dict[str, str], Dict[str, str]]:
+    """
+    Select the cpu/bios/license fields of a host record in a single pass.
+    
+    Missing keys become empty strings. XenAPI records contain only primitive
+    values, so str() cannot fail and plain strings skip the conversion.
+    
+    Returns:
+        Tuple of (cpu, bios, license) dictionaries
+    """
+    sources = (
+        host_record.get('cpu_info', {}) or {},
+        host_record.get('bios_strings', {}) or {},
+        host_record.get('license_params', {}) or {},
+    )
+    sections: tuple[Dict[str, str], Dict[str, str], Dict[str, str]] = ({}, {}, {})
+    for section, k in _SELECTED_FIELDS:
+        v = sources[section].get(k, "")
+        sections[section][k] = v if type(v) is str else str(v)
+    return sections
+
+
+@dataclasses.dataclass(slots=True)
+class HostInfo:
+    """Tailored host information, converted to a plain dict only when returned to the client."""
+    
+    uuid: str
+    name: str
+    description: str
+    memory_free: int
+    memory_total: int
+    cpu: Dict[str, str]
+    bios: Dict[str, str]
+    version: Dict[str, str]
+    license: Dict[str, str]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Return the host information in the tool's response format.
+        
+        Values are only str, int and dicts of those, so FastMCP's
+        pydantic-core encoder serializes them without any fallback conversion.
+        """
+        return {
+            "uuid": self.uuid,
+            "name": self.name,
+            "description": self.description,
+            "memory": {
+                "free": self.memory_free,
+                "total": self.memory_total,
+            },
+            "cpu": self.cpu,
+            "bios": self.bios,
+            "version": self.version,
+            "license": self.license,
+        }
+
+
+def _build_host_info(host_record: Dict[str, Any], total_memory: int, free_memory: int = 0) -> HostInfo:
+    """Build tailored host information with filtered cpu/bios/license fields."""
+    cpu, bios, license_params = _extract_host_fields(host_record)
+    return HostInfo(
+        host_record.get('uuid', ''),
+        host_record.get('name_label', ''),
+        host_record.get('name_description', ''),
+        free_memory,
+        total_memory,
+        cpu,
+        bios,
+        host_record.get('software_version', {}),
+        license_params,
+    )
+
+
+class _TTLCache:
+    """Small thread-safe in-process cache whose entries expire after a fixed TTL."""
+    
+    def __init__(self, ttl: float, maxsize: int = 128) -> None:
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[Any, tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+    
+    def get(self, key: Any, count: bool = True) -> Any:
+        """
+        Return the cached value for key, or None if it is missing or expired.
+        
+        With count=False the lookup is not added to the hit/miss counters, for
+        internal probes whose outcome the caller records itself via record().
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                self._entries.pop(key, None)
+                if count:
+                    self.misses += 1
+                return None
+            if count:
+                self.hits += 1
+            return entry[1]
+    
+    def record(self, hits: int = 0, misses: int = 0) -> None:
+        """Add lookup outcomes decided by the caller to the hit/miss counters."""
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+    
+    def set(self, key: Any, value: Any) -> None:
+        """Store value under key, evicting expired then oldest entries when full."""
+        now = time.monotonic()
+        with self._lock:
+            self._entries.pop(key, None)
+            if len(self._entries) >= self.maxsize:
+                for stale_key in [k for k, (expiry, _) in self._entries.items() if expiry <= now]:
+                    del self._entries[stale_key]
+                while len(self._entries) >= self.maxsize:
+                    del self._entries[next(iter(self._entries))]
+            self._entries[key] = (now + self.ttl, value)
+
+
+# Cache TTLs in seconds: host records change rarely, free memory is volatile.
+# The default cache size comfortably holds a full pool (at most 64 hosts).
+HOST_STATIC_TTL = 300
+HOST_MEMORY_TTL = 5
+
+# Keyed by host uuid -> (host_ref, HostInfo without free memory); _ALL_HOSTS -> tuple of pool host uuids
+_static_host_cache = _TTLCache(ttl=HOST_STATIC_TTL)
+# Keyed by host uuid -> free memory in bytes
+_memory_cache = _TTLCache(ttl=HOST_MEMORY_TTL)
+_ALL_HOSTS = object()
+
+# Concurrent cache misses share one fetch: waiters join the in-flight static refresh
+# task, and in-flight free memory computations are shared per host uuid
+_static_refresh_task: Optional["asyncio.Task[None]"] = None
+_free_memory_inflight: Dict[str, "asyncio.Task[int]"] = {}
+
+
+# Upper bound on concurrent XenAPI calls from tool handlers, so a large pool does not flood xapi.
+# Equal to SESSION_POOL_MAX_IDLE so a full fan-out runs entirely on pooled sessions.
+XENAPI_MAX_CONCURRENCY = SESSION_POOL_MAX_IDLE
+_xenapi_semaphore = asyncio.Semaphore(XENAPI_MAX_CONCURRENCY)
+
+
+async def _run_xenapi(func, *args):
+    """Run a blocking XenAPI helper in a worker thread, bounded by XENAPI_MAX_CONCURRENCY."""
+    async with _xenapi_semaphore:
+        return await asyncio.to_thread(func, *args)
+
+
+def _lookup_static_host_info(host_uuid: Optional[str]) -> Optional[List[tuple[str, HostInfo]]]:
+    """
+    Return cached static entries for the requested host(s), or None if any entry is missing.
+    
+    Probes are not counted; _get_static_host_info records one outcome per requested host.
+    """
+    host_uuids = [host_uuid] if host_uuid else _static_host_cache.get(_ALL_HOSTS, count=False)
+    if host_uuids is None:
+        return None
+    entries = [_static_host_cache.get(uuid, count=False) for uuid in host_uuids]
+    if any(entry is None for entry in entries):
+        return None
+    return entries
+
+
+async def _refresh_static_host_info() -> None:
+    """Fetch all host records and repopulate the static host cache."""
+    host_records, metrics_records = await _run_xenapi(_fetch_host_records)
+    host_uuids = []
+    for host_ref, host_record in host_records.items():
+        host_info = _build_host_info(host_record, _get_host_memory_total(host_record, metrics_records))
+        _static_host_cache.set(host_info.uuid, (host_ref, host_info))
+        host_uuids.append(host_info.uuid)
+    _static_host_cache.set(_ALL_HOSTS, tuple(host_uuids))
+
+
+def _clear_static_refresh_task(task: "asyncio.Task[None]") -> None:
+    """Done callback: forget the finished refresh so the next miss starts a new one."""
+    global _static_refresh_task
+    if _static_refresh_task is task:
+        _static_refresh_task = None
+    # Mark a failure as retrieved even if every waiter was cancelled
+    if not task.cancelled():
+        task.exception()
+
+
+async def _get_static_host_info(host_uuid: Optional[str]) -> Optional[List[tuple[str, HostInfo]]]:
+    """
+    Return static entries for the requested host(s), refreshing the cache at most once per miss.
+    
+    Returns None for a host_uuid that is not in the pool. While the cached pool
+    membership is fresh, that answer comes from the cache without a refresh.
+    
+    Each requested host counts as one hit if it was served from the cache, or
+    one miss if the request had to wait for a refresh.
+    """
+    entries = _lookup_static_host_info(host_uuid)
+    if entries is not None:
+        _static_host_cache.record(hits=len(entries))
+        return entries
+    if host_uuid:
+        pool_uuids = _static_host_cache.get(_ALL_HOSTS, count=False)
+        if pool_uuids is not None and host_uuid not in pool_uuids:
+            _static_host_cache.record(hits=1)
+            return None
+    global _static_refresh_task
+    task = _static_refresh_task
+    if task is None:
+        task = _static_refresh_task = asyncio.ensure_future(_refresh_static_host_info())
+        task.add_done_callback(_clear_static_refresh_task)
+    # All waiters share the outcome, so a failing xapi fails them together instead of
+    # being retried once per waiter; shield so one cancelled request keeps the refresh going
+    await asyncio.shield(task)
+    entries = _lookup_static_host_info(host_uuid)
+    _static_host_cache.record(misses=len(entries) if entries else 1)
+    return entries
+
+
+async def _compute_and_cache_free_memory(host_ref: str, host_uuid: str) -> int:
+    """Compute free memory for one host and store it in the memory cache."""
+    free_memory = await _run_xenapi(_compute_free_memory, host_ref)
+    _memory_cache.set(host_uuid, free_memory)
+    return free_memory
+
+
+async def _get_free_memory(host_ref: str, host_uuid: str) -> int:
+    """Return free memory for one host, joining an in-flight computation if there is one."""
+    free_memory = _memory_cache.get(host_uuid)
+    if free_memory is not None:
+        return free_memory
+    task = _free_memory_inflight.get(host_uuid)
+    if task is None:
+        task = asyncio.ensure_future(_compute_and_cache_free_memory(host_ref, host_uuid))
+        _free_memory_inflight[host_uuid] = task
+        task.add_done_callback(lambda _: _free_memory_inflight.pop(host_uuid, None))
+    # Shield the shared task so one cancelled request does not cancel it for the others
+    return await asyncio.shield(task)
+
+
+async def _get_free_memories(entries: List[tuple[str, HostInfo]]) -> List[int]:
+    """Return free memory for each host entry, computing only the ones not cached."""
+    # compute_free_memory has no bulk variant, so fan it out with bounded concurrency
+    return await asyncio.gather(
+        *(_get_free_memory(host_ref, host_info.uuid) for host_ref, host_info in entries)
+    )
+
+
+# Shared error response returned as-is on every call; callers must treat it as read-only
+_NO_CONFIG_ERROR: Dict[str, str] = {"error": "XenServer connection not configured"}
 
 
 @xenserver_mcp.tool()
-def get_all_host_info(host_uuid: Optional[str] = None) -> Dict[str, Any]:
+async def get_all_host_info(host_uuid: Optional[str] = None) -> Dict[str, Any]:
     """
     Get comprehensive host information for XenServer hosts in a pool.
     
@@ -256,35 +733,35 @@ def get_all_host_info(host_uuid: Optional[str] = None) -> Dict[str, Any]:
             - version: Software version dictionary
             - license: License information dictionary
     """
-    if not xenserver_client:
-        return {"error": "XenServer connection not configured"}
+    if not get_client():
+        return _NO_CONFIG_ERROR
     
     try:
-        with xenserver_client.session() as session:
-            # Determine which hosts to process
-            if host_uuid:
-                try:
-                    host_ref = session.xenapi.host.get_by_uuid(host_uuid)
-                    hosts_to_process = [host_ref]
-                except XenAPI.Failure:
-                    return {"error": f"Host with UUID '{host_uuid}' not found"}
-            else:
-                hosts_to_process = session.xenapi.host.get_all()
-            
-            # Build host information list
-            host_list = [_build_host_info(session, host_ref) 
-                        for host_ref in hosts_to_process]
-            
-            # Return appropriate format based on query type
-            if host_uuid:
-                return host_list[0] if host_list else {"error": "Host not found"}
-            
-            return {
-                "hosts": host_list,
-                "total_hosts": len(host_list)
-            }
-            
-    except XenAPI.Failure as xen_error:
+        # Only talk to XenServer when a cached entry is missing or expired
+        entries = await _get_static_host_info(host_uuid)
+        if entries is None:
+            return {"error": f"Host with UUID '{host_uuid}' not found"}
+        
+        free_memories = await _get_free_memories(entries)
+        logger.debug(
+            f"Host info cache: static hits={_static_host_cache.hits} misses={_static_host_cache.misses}, "
+            f"memory hits={_memory_cache.hits} misses={_memory_cache.misses}"
+        )
+        
+        # Build host information list
+        host_list = [dataclasses.replace(host_info, memory_free=free_memory)
+                    for (_, host_info), free_memory in zip(entries, free_memories)]
+        
+        # Return appropriate format based on query type
+        if host_uuid:
+            return host_list[0].to_dict()
+        
+        return {
+            "hosts": [host_info.to_dict() for host_info in host_list],
+            "total_hosts": len(host_list)
+        }
+        
+    except _load_xenapi().Failure as xen_error:
         logger.error(f"XenAPI error: {xen_error.details}")
         return {"error": f"XenAPI error: {xen_error.details[0] if xen_error.details else 'Unknown error'}"}
     except Exception as e:
@@ -292,19 +769,80 @@ def get_all_host_info(host_uuid: Optional[str] = None) -> Dict[str, Any]:
         return {"error": f"Error getting host info: {str(e)}"}
 
 
+# Interval in seconds between keep-alive checks of pooled XenAPI sessions
+SESSION_KEEPALIVE_INTERVAL = 300
+
+
+async def _keep_sessions_warm(client: XenServerClient) -> None:
+    """
+    Log in once ahead of the first tool call, then periodically ping pooled sessions.
+    
+    Runs as a background task so application startup never waits on XenServer.
+    """
+    try:
+        await asyncio.to_thread(client._ensure_session)
+    except Exception as e:
+        logger.warning(f"Could not pre-establish XenServer session: {e}")
+    while True:
+        await asyncio.sleep(SESSION_KEEPALIVE_INTERVAL)
+        try:
+            await asyncio.to_thread(client.ping_sessions)
+        except Exception as e:
+            logger.warning(f"XenServer session keep-alive failed: {e}")
+
+
 @contextlib.asynccontextmanager
 async def lifespan(app: Starlette):
     """
     Manage the lifecycle of the XenServer MCP session manager.
     
+    A background task establishes a XenAPI session right after startup, so
+    the first tool call usually does not pay for the login, and then keeps
+    pooled sessions warm. Startup itself never waits on XenServer. Pooled
+    XenAPI sessions are logged out on shutdown.
+    
     Args:
         app: Starlette application instance
         
     Yields:
         None - Context for application lifetime
     """
-    async with xenserver_mcp.session_manager.run():
-        yield
+    xenserver_client = get_client()
+    keepalive_task = None
+    try:
+        async with xenserver_mcp.session_manager.run():
+            if xenserver_client:
+                keepalive_task = asyncio.create_task(_keep_sessions_warm(xenserver_client))
+            yield
+    finally:
+        if keepalive_task:
+            keepalive_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await keepalive_task
+        if xenserver_client:
+            await asyncio.to_thread(xenserver_client.shutdown_sessions)
+
+
+def _render_cache_metrics() -> List[str]:
+    """Return host info cache hit/miss counters as Prometheus text exposition lines."""
+    caches = (("static", _static_host_cache), ("memory", _memory_cache))
+    lines = [
+        "# HELP host_info_cache_hits_total Host info cache hits.",
+        "# TYPE host_info_cache_hits_total counter",
+    ]
+    lines += [f'host_info_cache_hits_total{{cache="{name}"}} {cache.hits}' for name, cache in caches]
+    lines += [
+        "# HELP host_info_cache_misses_total Host info cache misses.",
+        "# TYPE host_info_cache_misses_total counter",
+    ]
+    lines += [f'host_info_cache_misses_total{{cache="{name}"}} {cache.misses}' for name, cache in caches]
+    return lines
+
+
+async def metrics(request: Request) -> PlainTextResponse:
+    """Expose XenAPI call and cache metrics in Prometheus text format."""
+    lines = xenapi_metrics.render() + _render_cache_metrics()
+    return PlainTextResponse("\n".join(lines) + "\n", media_type="text/plain; version=0.0.4")
 
 
 def create_app() -> Starlette:
@@ -319,6 +857,7 @@ def create_app() -> Starlette:
     
     app = Starlette(
         routes=[
+            Route("/metrics", metrics),
             Mount("/", xenserver_mcp.streamable_http_app()),
         ],
         lifespan=lifespan,
@@ -0,0 +1,88 @@
+"""Tests for the host info cache in front of XenAPI."""
+
+import asyncio
+import os
+import sys
+import time
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402
+
+# Stand-in for XENAPI_TIMEOUT so a failing xapi costs a fraction of a second per attempt
+FAKE_TIMEOUT = 0.3
+
+
+class HostCacheTest(unittest.IsolatedAsyncioTestCase):
+    """Exercise get_all_host_info against a stubbed XenAPI layer."""
+
+    def setUp(self) -> None:
+        self.fetch_calls = 0
+        patches = [
+            mock.patch.object(main, "get_client", return_value=object()),
+            mock.patch.object(main, "_static_host_cache", main._TTLCache(ttl=main.HOST_STATIC_TTL)),
+            mock.patch.object(main, "_memory_cache", main._TTLCache(ttl=main.HOST_MEMORY_TTL)),
+            mock.patch.object(main, "_compute_free_memory", return_value=1024),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _stub_fetch(self, fetch) -> None:
+        def counted():
+            self.fetch_calls += 1
+            return fetch()
+        patcher = mock.patch.object(main, "_fetch_host_records", side_effect=counted)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def test_concurrent_cold_misses_fail_together(self) -> None:
+        def unreachable():
+            time.sleep(FAKE_TIMEOUT)
+            raise TimeoutError("timed out")
+        self._stub_fetch(unreachable)
+
+        start = time.monotonic()
+        results = await asyncio.gather(*(main.get_all_host_info() for _ in range(4)))
+        elapsed = time.monotonic() - start
+
+        self.assertEqual(self.fetch_calls, 1)
+        self.assertLess(elapsed, FAKE_TIMEOUT * 2)
+        for result in results:
+            self.assertIn("timed out", result["error"])
+
+    def _stub_pool(self) -> None:
+        def records():
+            time.sleep(0.05)
+            return (
+                {"OpaqueRef:h0": {"uuid": "uuid-0", "name_label": "host0", "metrics": "OpaqueRef:m0"}},
+                {"OpaqueRef:m0": {"memory_total": "2048"}},
+            )
+        self._stub_fetch(records)
+
+    async def test_concurrent_cold_misses_share_one_refresh(self) -> None:
+        self._stub_pool()
+
+        results = await asyncio.gather(*(main.get_all_host_info() for _ in range(4)))
+
+        self.assertEqual(self.fetch_calls, 1)
+        for result in results:
+            self.assertEqual(result["total_hosts"], 1)
+            self.assertEqual(result["hosts"][0]["memory"], {"free": 1024, "total": 2048})
+
+    async def test_unknown_host_answered_from_warm_cache(self) -> None:
+        self._stub_pool()
+        await main.get_all_host_info()
+
+        for _ in range(3):
+            result = await main.get_all_host_info("uuid-missing")
+            self.assertEqual(result, {"error": "Host with UUID 'uuid-missing' not found"})
+
+        self.assertEqual(self.fetch_calls, 1)
+        self.assertEqual(main._static_host_cache.misses, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()